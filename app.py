@@ -1,28 +1,73 @@
-import sqlite3
+import time
+_rerun_started = time.perf_counter()
 import streamlit as st
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.output_parsers import StructuredOutputParser, ResponseSchema
 import re
 import html
 import json
 from tools import (
     init_db,
-    insert_candidate,
+    upsert_candidate,
     insert_question_rating,
     validate_and_extract_stacks,
     generate_tech_questions,
-    evaluate_answers
+    evaluate_answers,
+    profile_log
 )
 
 from dotenv import load_dotenv
 import os
 
+# On the first run this is the cold import cost; on later reruns the modules are already loaded
+profile_log("app imports", _rerun_started)
+
 # --- Setup ---
+_setup_started = time.perf_counter()
 load_dotenv()
 groq_api_key = os.getenv('GROQ_API_KEY')
+init_db()
+
+
+@st.cache_resource
+def get_info_chat(api_key):
+    # Imported here so the first page load doesn't pay for langchain_openai
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        api_key=api_key,
+        base_url="https://api.groq.com/openai/v1",
+        model="llama3-8b-8192",
+        temperature=0.2
+    )
+
+
+
+def ensure_screening_attempt():
+    # Retries the upsert if an earlier one failed (e.g. the database was locked)
+    if st.session_state.attempt_id is None:
+        st.session_state.candidate_id, st.session_state.attempt_id = upsert_candidate(st.session_state.candidate_data)
+        st.session_state.save_error = None if st.session_state.attempt_id is not None else (
+            "⚠️ We couldn't save your details right now. Your answers are kept and will be saved as soon as possible."
+        )
+    return st.session_state.attempt_id
+
+
+def save_pending_ratings():
+    # Stacks stay pending until their ratings are stored, so a failed upsert is retried on a later rerun
+    for stack_idx, evaluations in enumerate(st.session_state.evaluations):
+        if not evaluations or stack_idx in st.session_state.rated_stack_idxs:
+            continue
+        if ensure_screening_attempt() is None:
+            return
+        for eval_item in evaluations:
+            insert_question_rating(
+                st.session_state.attempt_id,
+                st.session_state.tech_stacks[stack_idx],
+                eval_item.get('question', ''),
+                eval_item['stars'],
+                eval_item.get('feedback', '')
+            )
+        st.session_state.rated_stack_idxs.add(stack_idx)
+
+profile_log("app setup", _setup_started)
 
 
 # --- Streamlit UI ---
@@ -89,11 +134,20 @@ if "messages" not in st.session_state:
     st.session_state.answers = {}
     st.session_state.evaluations = []
     st.session_state.candidate_id = None
+    st.session_state.attempt_id = None
+    st.session_state.rated_stack_idxs = set()
+    st.session_state.save_error = None
     st.session_state.show_final_message = False
     st.session_state.step = 0
     st.session_state.messages.append({"role": "assistant", "content": "👋 Hi! I'm your AI hiring assistant. Let's get started. What's your full name?"})
 st.session_state.feedback_phase = False
 
+# Retry saving the candidate if it failed on an earlier rerun, and keep the failure visible
+if st.session_state.info_collected and st.session_state.attempt_id is None:
+    ensure_screening_attempt()
+if st.session_state.get("save_error"):
+    st.error(st.session_state.save_error)
+
 
 
 # --- Chat Display (Only for info collection phase) ---
@@ -148,13 +202,8 @@ if not st.session_state.info_collected:
                 </div>
             """, unsafe_allow_html=True)
 
-        # Create chat instance
-        chat = ChatOpenAI(
-            api_key=groq_api_key,
-            base_url="https://api.groq.com/openai/v1",
-            model="llama3-8b-8192",
-            temperature=0.2
-        )
+        # Create chat instance (shared across reruns)
+        chat = get_info_chat(groq_api_key)
 
         # History including system prompt
         chat_history = [
@@ -183,6 +232,9 @@ if not st.session_state.info_collected:
                     st.session_state.info_collected = True
                     st.session_state.tech_stack_phase = True
 
+                    # Repeat applicants resolve to their existing candidate row; each session is a new attempt
+                    ensure_screening_attempt()
+
                     # Friendly user summary message
                     summary_msg = (
                         f"✅ Thanks, {candidate_data['full_name']}!\n\n"
@@ -295,23 +347,38 @@ if st.session_state.tech_stacks and not st.session_state.tech_stack_phase and no
     if st.session_state.step == 10:
         st.session_state.feedback_phase = True
         st.subheader(f"Evaluation for: {current_stack}")
-        try:
-            with st.spinner("Evaluating answers..."):
-                evaluations = evaluate_answers(
-                    current_stack,
-                    st.session_state.questions,
-                    st.session_state.answers,groq_api_key
-                )
-            if evaluations:
-                if len(st.session_state.evaluations) <= st.session_state.current_stack_idx:
-                    st.session_state.evaluations.append(evaluations)
-                else:
-                    st.session_state.evaluations[st.session_state.current_stack_idx] = evaluations
+        stack_idx = st.session_state.current_stack_idx
+        already_evaluated = (
+            len(st.session_state.evaluations) > stack_idx
+            and st.session_state.evaluations[stack_idx]
+        )
+        # Evaluate once per stack; reruns reuse the stored result so the feedback shown matches what was saved
+        if not already_evaluated:
+            try:
+                with st.spinner("Evaluating answers..."):
+                    evaluations = evaluate_answers(
+                        current_stack,
+                        st.session_state.questions,
+                        st.session_state.answers,groq_api_key
+                    )
+                # Convert star ratings up front so a bad value can't fail halfway through saving
+                evaluations = [
+                    dict(item, stars=int(item.get('stars', 0)))
+                    for item in evaluations if isinstance(item, dict)
+                ]
+                if not evaluations:
+                    st.error("Evaluation failed or returned empty.")
+            except Exception as e:
+                st.error(f"Error evaluating answers: {e}")
+                evaluations = []
+
+            if len(st.session_state.evaluations) <= stack_idx:
+                st.session_state.evaluations.append(evaluations)
             else:
-                st.error("Evaluation failed or returned empty.")
-        except Exception as e:
-            st.error(f"Error evaluating answers: {e}")
-            st.session_state.evaluations.append([])
+                st.session_state.evaluations[stack_idx] = evaluations
+
+        # Store ratings once per stack, attached to this session's screening attempt
+        save_pending_ratings()
 
         
 
@@ -387,32 +454,8 @@ if st.session_state.tech_stacks and not st.session_state.tech_stack_phase and no
                         st.session_state.show_final_message = True
                         st.rerun()
 # --- Final Thank You Message ---
-# Insert candidate if not already done
-                if st.session_state.candidate_id is None:
-                    st.session_state.candidate_id = insert_candidate({
-                        'full_name': st.session_state.candidate_data['full_name'],
-                        'email': st.session_state.candidate_data['email'],
-                        'phone': st.session_state.candidate_data['phone'],
-                        'experience': st.session_state.candidate_data['experience'],
-                        'position': st.session_state.candidate_data['position'],
-                        'location': st.session_state.candidate_data['location'],
-                        'tech_stacks': st.session_state.tech_stacks
-                    })
-
-                # Insert question ratings for this stack
-                for eval_item in evaluations:
-                    if isinstance(eval_item, dict):
-                        question = eval_item.get('question', '')
-                        stars = int(eval_item.get('stars', 0))
-                        feedback = eval_item.get('feedback', '')
-                        insert_question_rating(
-                            st.session_state.candidate_id,
-                            current_stack,
-                            question,
-                            stars,
-                            feedback
-                        )
 if st.session_state.get("show_final_message", False):
+    save_pending_ratings()
     st.markdown(
         "<h2 style='text-align:center; color:green;'>🙏 Thank you for participating!</h2>"
         "<p style='text-align:center;'>Your responses are under review.<br>Our HR team may contact you for further steps.</p>",
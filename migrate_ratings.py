@@ -0,0 +1,154 @@
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import tools
+
+BATCH_SIZE = 5000
+
+
+def merge_duplicate_emails(conn, batch_size=BATCH_SIZE):
+    # Emails used to be stored as typed, so one applicant may have several candidate rows.
+    # The newest row (highest id) holds the latest profile and absorbs the others' ratings and attempts.
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, email_address FROM candidates ORDER BY id')
+    ids_by_email = {}
+    for candidate_id, email in cursor.fetchall():
+        ids_by_email.setdefault(tools.normalize_email(email), []).append(candidate_id)
+
+    merged = renamed = pending = 0
+    for email, candidate_ids in ids_by_email.items():
+        keep_id, duplicate_ids = candidate_ids[-1], candidate_ids[:-1]
+        for duplicate_id in duplicate_ids:
+            cursor.execute('UPDATE question_ratings SET candidate_id = ? WHERE candidate_id = ?', (keep_id, duplicate_id))
+            cursor.execute('UPDATE screening_attempts SET candidate_id = ? WHERE candidate_id = ?', (keep_id, duplicate_id))
+            cursor.execute('DELETE FROM candidates WHERE id = ?', (duplicate_id,))
+            merged += 1
+            pending += 1
+        cursor.execute(
+            'UPDATE candidates SET email_address = ? WHERE id = ? AND email_address != ?',
+            (email, keep_id, email)
+        )
+        renamed += cursor.rowcount
+        pending += cursor.rowcount
+        if pending >= batch_size:
+            conn.commit()
+            pending = 0
+    conn.commit()
+    return merged, renamed
+
+
+def count_email_duplicates(conn):
+    cursor = conn.cursor()
+    cursor.execute('SELECT email_address FROM candidates')
+    emails = [row[0] for row in cursor.fetchall()]
+    normalized = [tools.normalize_email(email) for email in emails]
+    return len(emails) - len(set(normalized)), sum(a != b for a, b in zip(emails, normalized))
+
+
+def delete_orphaned_ratings(conn, batch_size=BATCH_SIZE):
+    # Ratings written with candidate_id=None (duplicate emails) or for a missing candidate cannot be re-linked.
+    # Legacy ratings that do belong to a candidate are left without an attempt: scoring treats
+    # attempt_id IS NULL as older than any real attempt, which a freshly created attempt row would not be.
+    cursor = conn.cursor()
+    cursor.execute('SELECT MAX(id) FROM question_ratings WHERE attempt_id IS NULL')
+    max_rating_id = cursor.fetchone()[0] or 0
+    deleted = 0
+    for start in range(0, max_rating_id + 1, batch_size):
+        cursor.execute('''
+            DELETE FROM question_ratings
+            WHERE id BETWEEN ? AND ?
+              AND attempt_id IS NULL
+              AND NOT EXISTS (SELECT 1 FROM candidates c WHERE c.id = question_ratings.candidate_id)
+        ''', (start, start + batch_size - 1))
+        deleted += cursor.rowcount
+        conn.commit()
+    return deleted
+
+
+def count_legacy(conn):
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM question_ratings WHERE attempt_id IS NULL')
+    legacy = cursor.fetchone()[0]
+    cursor.execute('''
+        SELECT COUNT(*) FROM question_ratings
+        WHERE attempt_id IS NULL
+          AND NOT EXISTS (SELECT 1 FROM candidates c WHERE c.id = question_ratings.candidate_id)
+    ''')
+    orphaned = cursor.fetchone()[0]
+    return legacy, orphaned
+
+
+def migrate(batch_size=BATCH_SIZE, dry_run=False):
+    tools.init_db()
+    conn = sqlite3.connect(tools.DB_PATH)
+    try:
+        duplicates, unnormalized = count_email_duplicates(conn)
+        print(f"Candidates with a duplicate email: {duplicates} ({unnormalized} emails not normalized)")
+        legacy, orphaned = count_legacy(conn)
+        print(f"Ratings from before screening attempts: {legacy} ({orphaned} with no candidate)")
+        if dry_run or not (unnormalized or orphaned):
+            return
+
+        started = time.perf_counter()
+        merged, renamed = merge_duplicate_emails(conn, batch_size)
+        merged_at = time.perf_counter()
+        print(f"Merged {merged} duplicate candidates and normalized {renamed} emails in {merged_at - started:.2f}s")
+
+        deleted = delete_orphaned_ratings(conn, batch_size)
+        deleted_at = time.perf_counter()
+        print(f"Deleted {deleted} orphaned ratings in {deleted_at - merged_at:.2f}s")
+    finally:
+        conn.close()
+
+    tools.rebuild_aggregates()
+    print(f"Rebuilt dashboard aggregates in {time.perf_counter() - deleted_at:.2f}s")
+
+
+def seed_synthetic(candidates, orphan_ratio=0.1):
+    # Mimics the pre-attempt schema: every repeat applicant left ratings with candidate_id=NULL
+    conn = sqlite3.connect(tools.DB_PATH)
+    cursor = conn.cursor()
+    stacks = ['Python', 'Java', 'React', 'AWS', 'SQL', 'Docker', 'Go', 'Rust']
+    cursor.executemany('''
+        INSERT INTO candidates (full_name, email_address, phone_number, years_of_experience, desired_position, current_location)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (
+        # Every 50th applicant re-applied with the previous email typed differently
+        (f"Candidate {i}", f"candidate{i}@example.com" if i % 50 else f" Candidate{i - 1}@Example.com", "9876543210", i % 15,
+         random.choice(['Backend Developer', 'Data Scientist', 'DevOps Engineer']),
+         random.choice(['Hyderabad', 'Bangalore', 'Pune', 'Remote']))
+        for i in range(candidates)
+    ))
+    cursor.executemany('''
+        INSERT INTO question_ratings (candidate_id, tech_stack, question, stars, feedback)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (
+        (None if random.random() < orphan_ratio else candidate_id, stack, f"Question {q}", random.randint(0, 3), "Synthetic")
+        for candidate_id in range(1, candidates + 1)
+        for stack in random.sample(stacks, 2)
+        for q in range(3)
+    ))
+    conn.commit()
+    conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Merge candidates with duplicate emails and delete orphaned legacy ratings.")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help="Only report how many ratings need migrating")
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help="Time the migration on a throwaway database seeded with N candidates")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp:
+            tools.DB_PATH = os.path.join(tmp, 'synthetic.db')
+            tools.init_db()
+            seed_synthetic(args.synthetic)
+            migrate(args.batch_size, args.dry_run)
+    else:
+        migrate(args.batch_size, args.dry_run)
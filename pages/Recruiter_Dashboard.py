@@ -0,0 +1,131 @@
+import time
+_rerun_started = time.perf_counter()
+import streamlit as st
+import pandas as pd
+from tools import (
+    init_db,
+    get_aggregate_revision,
+    get_filter_options,
+    get_leaderboard,
+    get_stack_distributions,
+    get_candidate_details,
+    profile_log
+)
+
+from dotenv import load_dotenv
+import hmac
+import os
+
+profile_log("dashboard imports", _rerun_started)
+
+# --- Setup ---
+_setup_started = time.perf_counter()
+load_dotenv()
+recruiter_password = os.getenv('RECRUITER_PASSWORD')
+init_db()
+profile_log("dashboard setup", _setup_started)
+
+
+# --- Cached Queries ---
+# Every rating insert bumps the aggregate revision, so passing it in as an argument
+# invalidates these entries as soon as new scores land. Entries for old revisions are
+# never read again, so max_entries keeps them from piling up on a long-running server.
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_filter_options(revision):
+    return get_filter_options()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_leaderboard(revision, position, location, tech_stack, limit):
+    return get_leaderboard(position, location, tech_stack, limit)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_stack_distributions(revision, position, location):
+    return get_stack_distributions(position, location)
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def load_candidate_details(revision, candidate_id):
+    return get_candidate_details(candidate_id)
+
+
+# --- Streamlit UI ---
+st.set_page_config(page_title="Recruiter Dashboard", layout="wide")
+st.title("TalentScout - Recruiter Dashboard")
+
+# Streamlit lists every file under pages/ in the sidebar, so candidates can reach this page too
+if not recruiter_password:
+    st.error("The recruiter dashboard is disabled. Set RECRUITER_PASSWORD in .env to enable it.")
+    st.stop()
+entered = st.text_input("Recruiter password", type="password")
+if not hmac.compare_digest(entered.encode(), recruiter_password.encode()):
+    st.stop()
+
+revision = get_aggregate_revision()
+options = load_filter_options(revision)
+
+# --- Filters ---
+with st.sidebar:
+    st.header("Filters")
+    position = st.selectbox("Desired Position", ["All"] + options['positions'])
+    location = st.selectbox("Current Location", ["All"] + options['locations'])
+    tech_stack = st.selectbox("Tech Stack", ["All"] + options['stacks'])
+    limit = st.slider("Leaderboard size", min_value=10, max_value=500, value=50, step=10)
+    if st.button("🔄 Refresh"):
+        st.cache_data.clear()
+        st.rerun()
+
+position = None if position == "All" else position
+location = None if location == "All" else location
+tech_stack = None if tech_stack == "All" else tech_stack
+
+# --- Leaderboard ---
+st.subheader(f"🏆 Leaderboard{f' for {tech_stack}' if tech_stack else ''}")
+leaderboard = load_leaderboard(revision, position, location, tech_stack, limit)
+if leaderboard:
+    st.dataframe(pd.DataFrame(leaderboard), hide_index=True, use_container_width=True)
+else:
+    st.info("No rated candidates match these filters yet.")
+
+# --- Per-Stack Score Distributions ---
+st.subheader("📊 Score Distribution per Stack")
+distributions = load_stack_distributions(revision, position, location)
+if distributions:
+    dist_df = pd.DataFrame(distributions)
+    if tech_stack:
+        dist_df = dist_df[dist_df['tech_stack'] == tech_stack]
+    chart_df = dist_df.pivot_table(
+        index='total_stars', columns='tech_stack', values='candidate_count', fill_value=0
+    )
+    st.bar_chart(chart_df)
+else:
+    st.info("No score data yet.")
+
+# --- Candidate Drill-down ---
+st.subheader("🔍 Candidate Details")
+if leaderboard:
+    labels = {row['candidate_id']: f"{row['full_name']} (#{row['candidate_id']})" for row in leaderboard}
+    selected_id = st.selectbox("Select a candidate", list(labels), format_func=labels.get)
+    details = load_candidate_details(revision, selected_id)
+    if details:
+        st.markdown(
+            f"**{details['full_name']}** · {details['desired_position']} · {details['current_location']}\n\n"
+            f"📧 {details['email_address']} · 📱 {details['phone_number']} · "
+            f"💼 {details['years_of_experience']} years"
+        )
+        if details['stack_scores']:
+            st.dataframe(pd.DataFrame(details['stack_scores']), hide_index=True, use_container_width=True)
+        for attempt in details['attempts']:
+            if attempt['attempt_id'] is None:
+                st.markdown("#### Earlier screening")
+            else:
+                st.markdown(
+                    f"#### Attempt #{attempt['attempt_id']} · {attempt['started_at']} · "
+                    f"{attempt['desired_position']} · {attempt['current_location']}"
+                )
+            if not attempt['ratings']:
+                st.caption("No rated answers in this attempt.")
+            for rating in attempt['ratings']:
+                stars = int(rating['stars'])
+                st.markdown(f"**[{rating['tech_stack']}]** {rating['question']}")
+                st.markdown(f"<span style='color:gold'>{'⭐' * stars}{'☆' * (3 - stars)}</span> ({stars}/3)", unsafe_allow_html=True)
+                st.markdown(f"*Feedback:* {rating['feedback']}")
+                st.divider()
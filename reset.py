@@ -1,7 +1,10 @@
 import sqlite3
+import tools
 
 def clear_all_tables():
-    conn = sqlite3.connect('talentscout_candidates.db')
+    # Creates any tables added since this database was made, so the deletes below can't fail
+    tools.init_db()
+    conn = sqlite3.connect(tools.DB_PATH)
     cursor = conn.cursor()
     
     # Display 5 entries from candidates
@@ -27,6 +30,11 @@ def clear_all_tables():
     # Delete all records (delete question_ratings first due to foreign key)
     try:
         cursor.execute('DELETE FROM question_ratings')
+        cursor.execute('DELETE FROM screening_attempts')
+        cursor.execute('DELETE FROM candidate_scores')
+        cursor.execute('DELETE FROM candidate_stack_scores')
+        cursor.execute('DELETE FROM stack_score_distribution')
+        cursor.execute('UPDATE aggregate_state SET revision = revision + 1')
         cursor.execute('DELETE FROM candidates')
         conn.commit()
         print('\nAll records have been deleted from all tables.')
@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+import migrate_ratings
+import tools
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'talentscout_test.db')
+    monkeypatch.setattr(tools, 'DB_PATH', path)
+    monkeypatch.setattr(tools, '_initialized_db_path', None)
+    tools.init_db()
+    return path
+
+
+def candidate(email='asha@example.com', **overrides):
+    data = {
+        'full_name': 'Asha Rao', 'email': email, 'phone': '9876543210',
+        'experience': 3, 'position': 'Backend Developer', 'location': 'Pune',
+    }
+    data.update(overrides)
+    return data
+
+
+def insert_legacy_rating(path, candidate_id, tech_stack, stars):
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        INSERT INTO question_ratings (candidate_id, tech_stack, question, stars, feedback)
+        VALUES (?, ?, 'Legacy question', ?, 'Legacy feedback')
+    ''', (candidate_id, tech_stack, stars))
+    conn.commit()
+    conn.close()
+
+
+def test_migration_keeps_post_deploy_attempt_as_latest(db_path):
+    candidate_id, _ = tools.upsert_candidate(candidate())
+    for _ in range(3):
+        insert_legacy_rating(db_path, candidate_id, 'Python', 0)
+    tools.rebuild_aggregates()
+
+    # A retake recorded by the new app before the one-off migration has been run
+    _, attempt_id = tools.upsert_candidate(candidate())
+    for _ in range(3):
+        tools.insert_question_rating(attempt_id, 'Python', 'New question', 3, 'Great')
+
+    migrate_ratings.migrate()
+
+    leaderboard = tools.get_leaderboard()
+    assert [(row['candidate_id'], row['total_stars']) for row in leaderboard] == [(candidate_id, 9)]
+    details = tools.get_candidate_details(candidate_id)
+    assert details['stack_scores'][0]['attempt_id'] == attempt_id
+    assert details['attempts'][0]['attempt_id'] == attempt_id
+    assert details['attempts'][-1]['attempt_id'] is None
+
+
+def test_migration_deletes_only_orphaned_ratings(db_path):
+    candidate_id, _ = tools.upsert_candidate(candidate())
+    insert_legacy_rating(db_path, candidate_id, 'Python', 2)
+    insert_legacy_rating(db_path, None, 'Python', 3)
+    insert_legacy_rating(db_path, candidate_id + 100, 'Go', 1)
+
+    migrate_ratings.migrate(batch_size=1)
+
+    conn = sqlite3.connect(db_path)
+    remaining = conn.execute('SELECT candidate_id, stars FROM question_ratings').fetchall()
+    conn.close()
+    assert remaining == [(candidate_id, 2)]
+    assert tools.get_leaderboard()[0]['total_stars'] == 2
+
+
+def test_upsert_matches_email_case_and_whitespace(db_path):
+    first_id, _ = tools.upsert_candidate(candidate(email='Asha@Example.com'))
+    second_id, _ = tools.upsert_candidate(candidate(email=' asha@example.com '))
+
+    assert first_id == second_id
+    assert tools.get_candidate_details(first_id)['email_address'] == 'asha@example.com'
+
+
+def test_migration_merges_duplicate_emails(db_path):
+    conn = sqlite3.connect(db_path)
+    for email, position in [('Asha@Example.com', 'Backend Developer'), ('asha@example.com ', 'Data Scientist')]:
+        conn.execute('''
+            INSERT INTO candidates (full_name, email_address, phone_number, years_of_experience, desired_position, current_location)
+            VALUES ('Asha Rao', ?, '9876543210', 3, ?, 'Pune')
+        ''', (email, position))
+    conn.commit()
+    conn.close()
+    insert_legacy_rating(db_path, 1, 'Python', 2)
+    insert_legacy_rating(db_path, 2, 'Go', 3)
+
+    migrate_ratings.migrate()
+
+    conn = sqlite3.connect(db_path)
+    candidates = conn.execute('SELECT id, email_address, desired_position FROM candidates').fetchall()
+    rating_owners = conn.execute('SELECT DISTINCT candidate_id FROM question_ratings').fetchall()
+    conn.close()
+    assert candidates == [(2, 'asha@example.com', 'Data Scientist')]
+    assert rating_owners == [(2,)]
+    assert tools.get_leaderboard()[0]['total_stars'] == 5
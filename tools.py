@@ -1,15 +1,32 @@
 import sqlite3
 import re
 import json
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import StructuredOutputParser, ResponseSchema
-from langchain.chains import LLMChain
-from langchain.schema import HumanMessage
+import os
+import time
+
+# LangChain is imported lazily inside the functions below; it dominates cold-start time
+# and is only needed once a candidate reaches an LLM-backed step.
+
+# --- Profiling ---
+# Set TALENTSCOUT_PROFILE=1 to print import, setup and first-use costs to the console
+PROFILE = os.getenv('TALENTSCOUT_PROFILE', '').lower() in ('1', 'true', 'yes')
+
+def profile_log(label, started):
+    if PROFILE:
+        print(f"[profile] {label}: {(time.perf_counter() - started) * 1000:.1f} ms")
 
 # --- DB Setup ---
+DB_PATH = 'talentscout_candidates.db'
+_initialized_db_path = None
+
 def init_db():
-    conn = sqlite3.connect('talentscout_candidates.db')
+    # Streamlit re-executes the page script on every interaction, but this module stays
+    # imported, so the schema work only happens once per process (and per DB_PATH)
+    global _initialized_db_path
+    if _initialized_db_path == DB_PATH:
+        return
+    started = time.perf_counter()
+    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS candidates (
@@ -26,43 +43,162 @@ def init_db():
         CREATE TABLE IF NOT EXISTS question_ratings (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             candidate_id INTEGER,
+            attempt_id INTEGER,
             tech_stack TEXT NOT NULL,
             question TEXT NOT NULL,
             stars INTEGER NOT NULL,
             feedback TEXT,
+            FOREIGN KEY(candidate_id) REFERENCES candidates(id),
+            FOREIGN KEY(attempt_id) REFERENCES screening_attempts(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS screening_attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            candidate_id INTEGER NOT NULL,
+            years_of_experience INTEGER NOT NULL,
+            desired_position TEXT NOT NULL,
+            current_location TEXT NOT NULL,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY(candidate_id) REFERENCES candidates(id)
         )
     ''')
+    # Databases created before screening attempts existed lack the attempt_id column
+    cursor.execute('PRAGMA table_info(question_ratings)')
+    if 'attempt_id' not in [column[1] for column in cursor.fetchall()]:
+        cursor.execute('ALTER TABLE question_ratings ADD COLUMN attempt_id INTEGER REFERENCES screening_attempts(id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_question_ratings_candidate ON question_ratings(candidate_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_question_ratings_attempt ON question_ratings(attempt_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_screening_attempts_candidate ON screening_attempts(candidate_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_position ON candidates(desired_position)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidates_location ON candidates(current_location)')
+
+    # --- Aggregates for the recruiter dashboard (kept up to date by insert_question_rating) ---
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS candidate_scores (
+            candidate_id INTEGER PRIMARY KEY,
+            total_stars INTEGER NOT NULL,
+            question_count INTEGER NOT NULL,
+            stack_count INTEGER NOT NULL,
+            FOREIGN KEY(candidate_id) REFERENCES candidates(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS candidate_stack_scores (
+            candidate_id INTEGER NOT NULL,
+            tech_stack TEXT NOT NULL,
+            attempt_id INTEGER,
+            total_stars INTEGER NOT NULL,
+            question_count INTEGER NOT NULL,
+            PRIMARY KEY (candidate_id, tech_stack),
+            FOREIGN KEY(candidate_id) REFERENCES candidates(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stack_score_distribution (
+            tech_stack TEXT NOT NULL,
+            total_stars INTEGER NOT NULL,
+            desired_position TEXT NOT NULL,
+            current_location TEXT NOT NULL,
+            candidate_count INTEGER NOT NULL,
+            PRIMARY KEY (tech_stack, total_stars, desired_position, current_location)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS aggregate_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            revision INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidate_scores_total ON candidate_scores(total_stars)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidate_stack_scores_stack ON candidate_stack_scores(tech_stack, total_stars)')
+
+    # Stack scores used to sum every attempt; they now track only the latest attempt per stack
+    cursor.execute('PRAGMA table_info(candidate_stack_scores)')
+    needs_rebuild = 'attempt_id' not in [column[1] for column in cursor.fetchall()]
+    if needs_rebuild:
+        cursor.execute('ALTER TABLE candidate_stack_scores ADD COLUMN attempt_id INTEGER')
+
+    # First run against an existing database: backfill the aggregates from the ratings already stored
+    cursor.execute('INSERT OR IGNORE INTO aggregate_state (id, revision) VALUES (1, 0)')
+    if cursor.rowcount or needs_rebuild:
+        _rebuild_aggregates(cursor)
     conn.commit()
     conn.close()
+    _initialized_db_path = DB_PATH
+    profile_log("init_db", started)
+
+def normalize_email(email):
+    # The LLM passes emails through as typed, so 'A@x.com' and 'a@x.com ' must match the same candidate
+    return email.strip().lower()
 
-def insert_candidate(data):
-    conn = sqlite3.connect('talentscout_candidates.db')
+def upsert_candidate(data):
+    """Create or update the candidate keyed on email and open a new screening attempt.
+
+    Returns (candidate_id, attempt_id), or (None, None) if the write failed.
+    """
+    email = normalize_email(data['email'])
+    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     try:
+        # Take the write lock up front so the profile read and the upsert see the same row
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute(
+            'SELECT id, desired_position, current_location FROM candidates WHERE email_address = ?',
+            (email,)
+        )
+        previous = cursor.fetchone()
+
         cursor.execute('''
             INSERT INTO candidates (full_name, email_address, phone_number, years_of_experience, desired_position, current_location)
             VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(email_address) DO UPDATE SET
+                full_name = excluded.full_name,
+                phone_number = excluded.phone_number,
+                years_of_experience = excluded.years_of_experience,
+                desired_position = excluded.desired_position,
+                current_location = excluded.current_location
+            RETURNING id
         ''', (
-            data['full_name'], data['email'], data['phone'],
+            data['full_name'], email, data['phone'],
             data['experience'], data['position'], data['location']
         ))
-        candidate_id = cursor.lastrowid
+        candidate_id = cursor.fetchone()[0]
+
+        if previous and (previous[1], previous[2]) != (data['position'], data['location']):
+            _move_distribution_buckets(cursor, candidate_id, previous[1], previous[2], data['position'], data['location'])
+        # Profile fields shown on the dashboard may have changed, so invalidate its cache
+        cursor.execute('UPDATE aggregate_state SET revision = revision + 1 WHERE id = 1')
+
+        cursor.execute('''
+            INSERT INTO screening_attempts (candidate_id, years_of_experience, desired_position, current_location)
+            VALUES (?, ?, ?, ?)
+        ''', (candidate_id, data['experience'], data['position'], data['location']))
+        attempt_id = cursor.lastrowid
         conn.commit()
-        return candidate_id
-    except sqlite3.IntegrityError:
-        return None
+        return candidate_id, attempt_id
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Error upserting candidate: {e}")
+        return None, None
     finally:
         conn.close()
 
-def insert_question_rating(candidate_id, tech_stack, question, stars, feedback):
-    conn = sqlite3.connect('talentscout_candidates.db')
+def insert_question_rating(attempt_id, tech_stack, question, stars, feedback):
+    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     try:
+        cursor.execute('SELECT candidate_id FROM screening_attempts WHERE id = ?', (attempt_id,))
+        row = cursor.fetchone()
+        if row is None:
+            print(f"Error inserting rating: unknown screening attempt {attempt_id}")
+            return False
+        candidate_id = row[0]
         cursor.execute('''
-            INSERT INTO question_ratings (candidate_id, tech_stack, question, stars, feedback)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (candidate_id, tech_stack, question, stars, feedback))
+            INSERT INTO question_ratings (candidate_id, attempt_id, tech_stack, question, stars, feedback)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (candidate_id, attempt_id, tech_stack, question, stars, feedback))
+        _update_aggregates(cursor, candidate_id, attempt_id, tech_stack, stars)
         conn.commit()
         return True
     except Exception as e:
@@ -71,14 +207,240 @@ def insert_question_rating(candidate_id, tech_stack, question, stars, feedback):
     finally:
         conn.close()
 
-# --- LLM Functions ---
-def validate_and_extract_stacks(position, input_text, groq_api_key):
-    chat = ChatOpenAI(
-        api_key=groq_api_key,
-        base_url="https://api.groq.com/openai/v1",
-        model="llama3-8b-8192",
-        temperature=0.1
+# --- Dashboard Aggregates ---
+def _update_aggregates(cursor, candidate_id, attempt_id, tech_stack, stars):
+    # Runs inside the rating insert's transaction so the aggregates never drift from question_ratings.
+    # A stack's score reflects only the candidate's latest attempt at it, so retaking a screening
+    # replaces the earlier score instead of adding to it.
+    cursor.execute(
+        'SELECT attempt_id, total_stars, question_count FROM candidate_stack_scores WHERE candidate_id = ? AND tech_stack = ?',
+        (candidate_id, tech_stack)
     )
+    row = cursor.fetchone()
+    if row is None:
+        old_total, old_count = None, 0
+        new_total, new_count = stars, 1
+    elif row[0] == attempt_id:
+        old_total, old_count = row[1], row[2]
+        new_total, new_count = old_total + stars, old_count + 1
+    elif row[0] is None or row[0] < attempt_id:
+        old_total, old_count = row[1], row[2]
+        new_total, new_count = stars, 1
+    else:
+        # A newer attempt already owns this stack's score
+        return
+
+    cursor.execute('''
+        INSERT INTO candidate_stack_scores (candidate_id, tech_stack, attempt_id, total_stars, question_count)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(candidate_id, tech_stack) DO UPDATE SET
+            attempt_id = excluded.attempt_id,
+            total_stars = excluded.total_stars,
+            question_count = excluded.question_count
+    ''', (candidate_id, tech_stack, attempt_id, new_total, new_count))
+
+    # Move the candidate from their old score bucket to the new one
+    cursor.execute('SELECT desired_position, current_location FROM candidates WHERE id = ?', (candidate_id,))
+    position, location = cursor.fetchone() or ('', '')
+    if old_total is not None:
+        cursor.execute('''
+            UPDATE stack_score_distribution SET candidate_count = candidate_count - 1
+            WHERE tech_stack = ? AND total_stars = ? AND desired_position = ? AND current_location = ?
+        ''', (tech_stack, old_total, position, location))
+    cursor.execute('''
+        INSERT INTO stack_score_distribution (tech_stack, total_stars, desired_position, current_location, candidate_count)
+        VALUES (?, ?, ?, ?, 1)
+        ON CONFLICT(tech_stack, total_stars, desired_position, current_location)
+        DO UPDATE SET candidate_count = candidate_count + 1
+    ''', (tech_stack, new_total, position, location))
+
+    cursor.execute('''
+        INSERT INTO candidate_scores (candidate_id, total_stars, question_count, stack_count)
+        VALUES (?, ?, ?, 1)
+        ON CONFLICT(candidate_id) DO UPDATE SET
+            total_stars = total_stars + excluded.total_stars,
+            question_count = question_count + excluded.question_count,
+            stack_count = stack_count + ?
+    ''', (candidate_id, new_total - (old_total or 0), new_count - old_count, 0 if old_total is not None else 1))
+    cursor.execute('UPDATE aggregate_state SET revision = revision + 1 WHERE id = 1')
+
+def _move_distribution_buckets(cursor, candidate_id, old_position, old_location, new_position, new_location):
+    # The distribution is split by position and location, so a changed profile moves every stack bucket
+    cursor.execute(
+        'SELECT tech_stack, total_stars FROM candidate_stack_scores WHERE candidate_id = ?',
+        (candidate_id,)
+    )
+    for tech_stack, total_stars in cursor.fetchall():
+        cursor.execute('''
+            UPDATE stack_score_distribution SET candidate_count = candidate_count - 1
+            WHERE tech_stack = ? AND total_stars = ? AND desired_position = ? AND current_location = ?
+        ''', (tech_stack, total_stars, old_position, old_location))
+        cursor.execute('''
+            INSERT INTO stack_score_distribution (tech_stack, total_stars, desired_position, current_location, candidate_count)
+            VALUES (?, ?, ?, ?, 1)
+            ON CONFLICT(tech_stack, total_stars, desired_position, current_location)
+            DO UPDATE SET candidate_count = candidate_count + 1
+        ''', (tech_stack, total_stars, new_position, new_location))
+
+def _rebuild_aggregates(cursor):
+    cursor.execute('DELETE FROM candidate_scores')
+    cursor.execute('DELETE FROM candidate_stack_scores')
+    cursor.execute('DELETE FROM stack_score_distribution')
+    # Only the latest attempt at each stack counts; legacy ratings without an attempt are older than any attempt
+    cursor.execute('''
+        INSERT INTO candidate_stack_scores (candidate_id, tech_stack, attempt_id, total_stars, question_count)
+        SELECT candidate_id, tech_stack, attempt_id, SUM(stars), COUNT(*)
+        FROM (
+            SELECT candidate_id, tech_stack, attempt_id, stars,
+                   COALESCE(attempt_id, 0) AS attempt_rank,
+                   MAX(COALESCE(attempt_id, 0)) OVER (PARTITION BY candidate_id, tech_stack) AS latest_rank
+            FROM question_ratings
+            WHERE candidate_id IS NOT NULL
+        )
+        WHERE attempt_rank = latest_rank
+        GROUP BY candidate_id, tech_stack
+    ''')
+    cursor.execute('''
+        INSERT INTO candidate_scores (candidate_id, total_stars, question_count, stack_count)
+        SELECT candidate_id, SUM(total_stars), SUM(question_count), COUNT(*)
+        FROM candidate_stack_scores
+        GROUP BY candidate_id
+    ''')
+    cursor.execute('''
+        INSERT INTO stack_score_distribution (tech_stack, total_stars, desired_position, current_location, candidate_count)
+        SELECT s.tech_stack, s.total_stars, c.desired_position, c.current_location, COUNT(*)
+        FROM candidate_stack_scores s
+        JOIN candidates c ON c.id = s.candidate_id
+        GROUP BY s.tech_stack, s.total_stars, c.desired_position, c.current_location
+    ''')
+    cursor.execute('UPDATE aggregate_state SET revision = revision + 1 WHERE id = 1')
+
+def rebuild_aggregates():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    try:
+        _rebuild_aggregates(cursor)
+        conn.commit()
+    finally:
+        conn.close()
+
+def _candidate_filters(position, location, table='c'):
+    clauses, params = [], []
+    if position:
+        clauses.append(f'{table}.desired_position = ?')
+        params.append(position)
+    if location:
+        clauses.append(f'{table}.current_location = ?')
+        params.append(location)
+    return ''.join(f' AND {clause}' for clause in clauses), params
+
+def _fetch_dicts(query, params=()):
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(query, params).fetchall()]
+    finally:
+        conn.close()
+
+def get_aggregate_revision():
+    # Cheap primary-key lookup; the dashboard uses it as its cache key
+    rows = _fetch_dicts('SELECT revision FROM aggregate_state WHERE id = 1')
+    return rows[0]['revision'] if rows else 0
+
+def get_filter_options():
+    positions = _fetch_dicts('SELECT DISTINCT desired_position AS value FROM candidates ORDER BY desired_position')
+    locations = _fetch_dicts('SELECT DISTINCT current_location AS value FROM candidates ORDER BY current_location')
+    stacks = _fetch_dicts('SELECT DISTINCT tech_stack AS value FROM stack_score_distribution ORDER BY tech_stack')
+    return {
+        'positions': [row['value'] for row in positions],
+        'locations': [row['value'] for row in locations],
+        'stacks': [row['value'] for row in stacks],
+    }
+
+def get_leaderboard(position=None, location=None, tech_stack=None, limit=50):
+    filters, params = _candidate_filters(position, location)
+    if tech_stack:
+        # Walks idx_candidate_stack_scores_stack in score order
+        return _fetch_dicts(f'''
+            SELECT c.id AS candidate_id, c.full_name, c.desired_position, c.current_location,
+                   c.years_of_experience, s.total_stars, s.question_count
+            FROM candidate_stack_scores s
+            JOIN candidates c ON c.id = s.candidate_id
+            WHERE s.tech_stack = ?{filters}
+            ORDER BY s.total_stars DESC
+            LIMIT ?
+        ''', [tech_stack] + params + [limit])
+    # Walks idx_candidate_scores_total in score order
+    return _fetch_dicts(f'''
+        SELECT c.id AS candidate_id, c.full_name, c.desired_position, c.current_location,
+               c.years_of_experience, s.total_stars, s.question_count, s.stack_count
+        FROM candidate_scores s
+        JOIN candidates c ON c.id = s.candidate_id
+        WHERE 1 = 1{filters}
+        ORDER BY s.total_stars DESC
+        LIMIT ?
+    ''', params + [limit])
+
+def get_stack_distributions(position=None, location=None):
+    # Buckets are split by position and location, so any filter combination is a sum over a small table
+    filters, params = _candidate_filters(position, location, table='d')
+    return _fetch_dicts(f'''
+        SELECT d.tech_stack, d.total_stars, SUM(d.candidate_count) AS candidate_count
+        FROM stack_score_distribution d
+        WHERE d.candidate_count > 0{filters}
+        GROUP BY d.tech_stack, d.total_stars
+        ORDER BY d.tech_stack, d.total_stars
+    ''', params)
+
+def get_candidate_details(candidate_id):
+    candidates = _fetch_dicts('''
+        SELECT id AS candidate_id, full_name, email_address, phone_number,
+               years_of_experience, desired_position, current_location
+        FROM candidates WHERE id = ?
+    ''', (candidate_id,))
+    if not candidates:
+        return None
+    details = candidates[0]
+    details['stack_scores'] = _fetch_dicts('''
+        SELECT tech_stack, total_stars, question_count, attempt_id
+        FROM candidate_stack_scores WHERE candidate_id = ?
+        ORDER BY total_stars DESC
+    ''', (candidate_id,))
+
+    # Ratings grouped per screening attempt, newest first
+    ratings_by_attempt = {}
+    for rating in _fetch_dicts('''
+        SELECT attempt_id, tech_stack, question, stars, feedback
+        FROM question_ratings WHERE candidate_id = ?
+        ORDER BY id
+    ''', (candidate_id,)):
+        ratings_by_attempt.setdefault(rating.pop('attempt_id'), []).append(rating)
+    attempts = _fetch_dicts('''
+        SELECT id AS attempt_id, started_at, years_of_experience, desired_position, current_location
+        FROM screening_attempts WHERE candidate_id = ?
+        ORDER BY id DESC
+    ''', (candidate_id,))
+    for attempt in attempts:
+        attempt['ratings'] = ratings_by_attempt.pop(attempt['attempt_id'], [])
+    if ratings_by_attempt.get(None):
+        # Ratings stored before screening attempts existed
+        attempts.append({
+            'attempt_id': None, 'started_at': None, 'years_of_experience': None,
+            'desired_position': None, 'current_location': None,
+            'ratings': ratings_by_attempt[None],
+        })
+    details['attempts'] = attempts
+    return details
+
+# --- Prompt Registry ---
+# Response schemas, parsers and prompt templates never change between calls, so each one
+# is built on first use and reused by every later call and rerun in this process.
+_PROMPTS = {}
+_CHAT_MODELS = {}
+
+def _build_stack_prompt():
+    from langchain.prompts import PromptTemplate
+    from langchain.output_parsers import StructuredOutputParser, ResponseSchema
 
     response_schemas = [
         ResponseSchema(name="stacks", description="List of valid, corrected tech stack names from the input"),
@@ -103,27 +465,11 @@ def validate_and_extract_stacks(position, input_text, groq_api_key):
     input_variables=["position", "input_text"],
     partial_variables={"format_instructions": parser.get_format_instructions()}
 )
+    return parser, prompt
 
-
-    chain = LLMChain(llm=chat, prompt=prompt)
-
-    try:
-        raw_output = chain.run(position=position, input_text=input_text)
-        parsed = parser.parse(raw_output)
-        stacks = parsed.get("stacks", [])
-        message = parsed.get("message", "")
-        return stacks, message
-    except Exception as e:
-        print(f"[ERROR] Stack validation failed: {e}")
-        return [], "⚠️ Couldn't parse LLM output properly. Please try entering your tech stacks again."
-
-def generate_tech_questions(stack_name, groq_api_key):
-    chat = ChatOpenAI(
-        api_key=groq_api_key,
-        base_url="https://api.groq.com/openai/v1",
-        model="llama3-8b-8192",
-        temperature=0.3
-    )
+def _build_question_prompt():
+    from langchain.prompts import PromptTemplate
+    from langchain.output_parsers import StructuredOutputParser, ResponseSchema
 
     response_schemas = [
         ResponseSchema(name="question", description="The interview question"),
@@ -140,23 +486,11 @@ def generate_tech_questions(stack_name, groq_api_key):
             "{format_instructions}"
         )
     )
+    return parser, prompt
 
-    try:
-        raw_output = chat.invoke([HumanMessage(content=prompt.format(stack_name=stack_name))]).content
-        match = re.search(r'(\[.*\])', raw_output, re.DOTALL)
-        questions_json = json.loads(match.group(1)) if match else []
-        return questions_json[:3]
-    except Exception as e:
-        print(f"[ERROR generating questions]: {e}")
-        return []
-
-def evaluate_answers(stack_name, questions, answers, groq_api_key):
-    chat = ChatOpenAI(
-        api_key=groq_api_key,
-        base_url="https://api.groq.com/openai/v1",
-        model="llama3-8b-8192",
-        temperature=0.0
-    )
+def _build_evaluation_prompt():
+    from langchain.prompts import PromptTemplate
+    from langchain.output_parsers import StructuredOutputParser, ResponseSchema
 
     response_schemas = [
         ResponseSchema(name="question", description="The original interview question"),
@@ -165,10 +499,6 @@ def evaluate_answers(stack_name, questions, answers, groq_api_key):
     ]
     parser = StructuredOutputParser.from_response_schemas(response_schemas)
 
-    qa_text = ""
-    for idx, q in enumerate(questions):
-        qa_text += f"\nQuestion {idx + 1}: {q['question']}\nAnswer: {answers.get(idx, '')}\n"
-
     prompt_template = PromptTemplate(
         input_variables=["qa_text"],
         partial_variables={"format_instructions": parser.get_format_instructions()},
@@ -183,6 +513,78 @@ def evaluate_answers(stack_name, questions, answers, groq_api_key):
             "{format_instructions}"
         )
     )
+    return parser, prompt_template
+
+_PROMPT_BUILDERS = {
+    'stacks': _build_stack_prompt,
+    'questions': _build_question_prompt,
+    'evaluation': _build_evaluation_prompt,
+}
+
+def get_prompt(name):
+    """Return the cached (parser, prompt) pair registered under name."""
+    if name not in _PROMPTS:
+        started = time.perf_counter()
+        _PROMPTS[name] = _PROMPT_BUILDERS[name]()
+        profile_log(f"build prompt '{name}'", started)
+    return _PROMPTS[name]
+
+def get_chat_model(groq_api_key, temperature):
+    key = (groq_api_key, temperature)
+    if key not in _CHAT_MODELS:
+        started = time.perf_counter()
+        from langchain.chat_models import ChatOpenAI
+        _CHAT_MODELS[key] = ChatOpenAI(
+            api_key=groq_api_key,
+            base_url="https://api.groq.com/openai/v1",
+            model="llama3-8b-8192",
+            temperature=temperature
+        )
+        profile_log(f"create chat model (temperature={temperature})", started)
+    return _CHAT_MODELS[key]
+
+# --- LLM Functions ---
+def validate_and_extract_stacks(position, input_text, groq_api_key):
+    from langchain.chains import LLMChain
+
+    chat = get_chat_model(groq_api_key, 0.1)
+    parser, prompt = get_prompt('stacks')
+    chain = LLMChain(llm=chat, prompt=prompt)
+
+    try:
+        raw_output = chain.run(position=position, input_text=input_text)
+        parsed = parser.parse(raw_output)
+        stacks = parsed.get("stacks", [])
+        message = parsed.get("message", "")
+        return stacks, message
+    except Exception as e:
+        print(f"[ERROR] Stack validation failed: {e}")
+        return [], "⚠️ Couldn't parse LLM output properly. Please try entering your tech stacks again."
+
+def generate_tech_questions(stack_name, groq_api_key):
+    from langchain.schema import HumanMessage
+
+    chat = get_chat_model(groq_api_key, 0.3)
+    _, prompt = get_prompt('questions')
+
+    try:
+        raw_output = chat.invoke([HumanMessage(content=prompt.format(stack_name=stack_name))]).content
+        match = re.search(r'(\[.*\])', raw_output, re.DOTALL)
+        questions_json = json.loads(match.group(1)) if match else []
+        return questions_json[:3]
+    except Exception as e:
+        print(f"[ERROR generating questions]: {e}")
+        return []
+
+def evaluate_answers(stack_name, questions, answers, groq_api_key):
+    from langchain.schema import HumanMessage
+
+    chat = get_chat_model(groq_api_key, 0.0)
+    _, prompt_template = get_prompt('evaluation')
+
+    qa_text = ""
+    for idx, q in enumerate(questions):
+        qa_text += f"\nQuestion {idx + 1}: {q['question']}\nAnswer: {answers.get(idx, '')}\n"
 
     try:
         full_prompt = prompt_template.format(qa_text=qa_text, stack_name=stack_name)